@@ -25,7 +25,7 @@ class WorkstationIntegrationTest(TestCase):
             codename__in=['view_workstation', 'add_workstation',
                           'change_workstation', 'delete_workstation']
         )
-        self.user.user_permissions.add(*permissions)
+        self.user.user_permissions.set(permissions)
 
         # Создаем тестовые данные
         self.location = Location.objects.create(name="Интеграционный цех")
@@ -6,6 +6,8 @@ core/admin.py
 """
 
 from django.contrib import admin
+from django.db.models import OuterRef, Subquery
+from django.utils import dateformat
 from django.utils.html import format_html
 from simple_history.admin import SimpleHistoryAdmin
 
@@ -41,20 +43,43 @@ class AuditableAdminMixin:
         obj._history_user = request.user
         super().save_model(request, obj, form, change)
     
+    def get_queryset(self, request):
+        """Аннотирует дату и автора последнего изменения (без N+1)."""
+        qs = super().get_queryset(request)
+        if not hasattr(self.model, 'history'):
+            return qs
+        
+        latest = (
+            self.model.history.model.objects
+            .filter(**{self.model._meta.pk.attname: OuterRef('pk')})
+            .order_by('-history_date', '-history_id')
+        )
+        return qs.annotate(
+            _last_change_date=Subquery(latest.values('history_date')[:1]),
+            _last_change_user=Subquery(latest.values('history_user__username')[:1]),
+        )
+    
     @admin.display(description="Последнее изменение")
     def last_change(self, obj):
         """Отображает дату и автора последнего изменения."""
         if not hasattr(obj, 'history'):
             return "—"
         
-        h = obj.history.first()
-        if not h:
+        if hasattr(obj, '_last_change_date'):
+            history_date = obj._last_change_date
+            history_user = obj._last_change_user
+        else:
+            h = obj.history.first()
+            history_date = h.history_date if h else None
+            history_user = h.history_user if h else None
+        
+        if not history_date:
             return "—"
         
         return format_html(
             "{}<br><small class='text-muted'>{}</small>",
-            h.history_date.strftime("%d.%m.%Y %H:%M"),
-            h.history_user or "system",
+            dateformat.format(history_date, "d.m.Y H:i"),
+            history_user or "system",
         )
 
 
@@ -0,0 +1,20 @@
+"""
+core/cache.py
+
+Общие хелперы для работы с кэшем.
+"""
+
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def cache_is_shared(alias="default"):
+    """
+    True, если кэш общий для всех процессов (Redis, memcached, БД, файлы).
+
+    LocMemCache живёт внутри одного воркера: инвалидация из другого
+    процесса его не затрагивает, поэтому на нём нельзя строить
+    ETag/версии, которые должны быть едиными для всех воркеров.
+    """
+    return not isinstance(caches[alias], (LocMemCache, DummyCache))
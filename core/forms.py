@@ -56,27 +56,60 @@ class BootstrapFormMixin:
     
     def _apply_bootstrap_styles(self):
         """Применяет Bootstrap классы ко всем полям."""
+        # Атрибуты полей класса вычисляются один раз и кэшируются на классе;
+        # для каждого экземпляра остаётся только attrs.update()
+        cls = type(self)
+        styles = cls.__dict__.get('_bootstrap_attrs')
+        if styles is None:
+            styles = {
+                field_name: self._build_widget_attrs(field_name, field)
+                for field_name, field in cls.base_fields.items()
+                if field_name not in self.exclude_fields
+            }
+            cls._bootstrap_attrs = styles
+        
         for field_name, field in self.fields.items():
             if field_name in self.exclude_fields:
                 continue
             
-            widget = field.widget
-            widget_type = self._get_widget_type(widget)
-            css_class = self.widget_css_classes.get(widget_type, 'form-control')
-            
-            if css_class:
-                existing_class = widget.attrs.get('class', '')
-                if css_class not in existing_class:
-                    widget.attrs['class'] = f"{existing_class} {css_class}".strip()
-            
-            # Добавляем placeholder из label если не задан
-            if widget_type in ('text', 'textarea', 'email', 'url', 'number', 'password'):
-                if 'placeholder' not in widget.attrs:
-                    widget.attrs['placeholder'] = field.label or field_name.replace('_', ' ').title()
+            # Поля, добавленные динамически, считаем на месте
+            attrs = styles.get(field_name)
+            if attrs is None:
+                attrs = self._build_widget_attrs(field_name, field)
             
-            # Применяем дополнительные атрибуты
-            if field_name in self.field_attrs:
-                widget.attrs.update(self.field_attrs[field_name])
+            widget_attrs = field.widget.attrs
+            for key, value in attrs.items():
+                if key != 'class':
+                    widget_attrs[key] = value
+                    continue
+                # Класс дописываем к уже заданному на экземпляре, а не заменяем
+                existing_class = widget_attrs.get('class', '')
+                existing = existing_class.split()
+                missing = [c for c in value.split() if c not in existing]
+                if missing:
+                    widget_attrs['class'] = " ".join([existing_class, *missing]).strip()
+    
+    def _build_widget_attrs(self, field_name, field):
+        """Возвращает итоговые attrs виджета поля."""
+        attrs = dict(field.widget.attrs)
+        widget_type = self._get_widget_type(field.widget)
+        css_class = self.widget_css_classes.get(widget_type, 'form-control')
+        
+        if css_class:
+            existing_class = attrs.get('class', '')
+            if css_class not in existing_class:
+                attrs['class'] = f"{existing_class} {css_class}".strip()
+        
+        # Добавляем placeholder из label если не задан
+        if widget_type in ('text', 'textarea', 'email', 'url', 'number', 'password'):
+            if 'placeholder' not in attrs:
+                attrs['placeholder'] = field.label or field_name.replace('_', ' ').title()
+        
+        # Применяем дополнительные атрибуты
+        if field_name in self.field_attrs:
+            attrs.update(self.field_attrs[field_name])
+        
+        return attrs
     
     def _get_widget_type(self, widget):
         """Определяет тип виджета."""
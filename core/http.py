@@ -0,0 +1,53 @@
+"""
+core/http.py
+
+HTTP-ответы общего назначения.
+"""
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.utils.functional import Promise
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson опционален
+    orjson = None
+
+
+if orjson is not None:
+    # Нестроковые ключи словарей — как у json.dumps; даты и время отдаются
+    # в DjangoJSONEncoder, чтобы формат совпадал с JsonResponse
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def _orjson_default(obj):
+    """Типы, которые orjson не сериализует сам (ленивые переводы, Decimal, даты и т.п.)."""
+    if isinstance(obj, Promise):
+        return str(obj)
+    return DjangoJSONEncoder().default(obj)
+
+
+class FastJsonResponse(HttpResponse):
+    """
+    JSON-ответ, сериализуемый через orjson.
+
+    Если orjson не установлен — используется стандартный
+    DjangoJSONEncoder (результат тот же, только медленнее).
+
+    Использование:
+        return FastJsonResponse({"results": [...]})
+    """
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        if orjson is not None:
+            content = orjson.dumps(
+                data, default=_orjson_default, option=_ORJSON_OPTIONS
+            )
+        else:
+            import json
+            # Компактно и без \uXXXX — как у orjson
+            content = json.dumps(
+                data, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(",", ":")
+            )
+        super().__init__(content=content, **kwargs)
@@ -7,12 +7,13 @@ core/mixins.py
 
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import transaction
 from django.db.models.deletion import ProtectedError
-from django.http import JsonResponse
 from django.utils.decorators import method_decorator
 from django.views.decorators.http import require_POST
 
 from core.audit import build_change_reason
+from core.http import FastJsonResponse
 
 
 class AuditMixin:
@@ -126,28 +127,32 @@ class DeleteViewMixin(AuditMixin):
         """Обработка DELETE запроса."""
         from django.shortcuts import get_object_or_404
         
-        obj = get_object_or_404(self.model, pk=pk)
-        
         try:
-            self.add_audit_info(obj)
-            obj.delete()
-            
-            response_data = {"ok": True}
-            
-            # Добавляем redirect если указан
-            redirect_url = self.get_success_url()
-            if redirect_url:
-                response_data["redirect"] = str(redirect_url)
-            
-            return JsonResponse(response_data)
+            # Блокировка строки, аудит и удаление — одна транзакция;
+            # при ProtectedError всё откатывается целиком
+            with transaction.atomic():
+                obj = get_object_or_404(
+                    self.model._default_manager.select_for_update(), pk=pk
+                )
+                self.add_audit_info(obj)
+                obj.delete()
         
         except ProtectedError as e:
             related = [str(o) for o in e.protected_objects]
-            return JsonResponse({
+            return FastJsonResponse({
                 "ok": False,
                 "error": "Нельзя удалить: есть связанные объекты",
                 "related": related[:10],  # Ограничиваем список
             }, status=400)
+        
+        response_data = {"ok": True}
+        
+        # Добавляем redirect если указан
+        redirect_url = self.get_success_url()
+        if redirect_url:
+            response_data["redirect"] = str(redirect_url)
+        
+        return FastJsonResponse(response_data)
 
 
 class SearchMixin:
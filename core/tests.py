@@ -1,3 +1,47 @@
-from django.test import TestCase
+import datetime
+import json
 
-# Create your tests here.
+from django import forms
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test import SimpleTestCase
+
+from core.forms import BootstrapFormMixin
+from core.http import FastJsonResponse
+
+
+class _ExtraClassMixin:
+    """Задаёт класс виджета до того, как отработает BootstrapFormMixin."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['name'].widget.attrs['class'] = 'js-extra'
+
+
+class _StyledForm(BootstrapFormMixin, _ExtraClassMixin, forms.Form):
+    name = forms.CharField(label="Имя")
+
+
+class BootstrapFormMixinTest(SimpleTestCase):
+    """Стили Bootstrap дописываются к классам виджета"""
+
+    def test_keeps_instance_class(self):
+        for _ in range(2):  # второй экземпляр берёт attrs из кэша класса
+            widget = _StyledForm().fields['name'].widget
+            self.assertEqual(widget.attrs['class'].split(), ['js-extra', 'form-control'])
+            self.assertEqual(widget.attrs['placeholder'], "Имя")
+
+
+class FastJsonResponseTest(SimpleTestCase):
+    """FastJsonResponse должен отдавать то же, что и JsonResponse"""
+
+    def test_matches_django_encoder(self):
+        data = {
+            "at": datetime.datetime(2024, 5, 1, 12, 30, 15, 123456),
+            "day": datetime.date(2024, 5, 1),
+            "time": datetime.time(8, 0, 0, 500000),
+            "counts": {1: "one", 2: "two"},
+        }
+        response = FastJsonResponse(data)
+
+        expected = json.loads(json.dumps(data, cls=DjangoJSONEncoder))
+        self.assertEqual(json.loads(response.content), expected)
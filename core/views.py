@@ -6,10 +6,10 @@ core/views.py
 """
 
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import JsonResponse
 from django.views import View
 from django.views.generic import ListView, DetailView, CreateView, UpdateView
 
+from core.http import FastJsonResponse
 from core.mixins import (
     AuditMixin,
     FormAuditMixin,
@@ -191,13 +191,13 @@ class BaseAjaxView(LoginRequiredMixin, View):
         if data:
             response_data.update(data)
         response_data.update(kwargs)
-        return JsonResponse(response_data)
+        return FastJsonResponse(response_data)
     
     def error_response(self, error, status=400, **kwargs):
         """Возвращает JSON ответ с ошибкой."""
         response_data = {'ok': False, 'error': error}
         response_data.update(kwargs)
-        return JsonResponse(response_data, status=status)
+        return FastJsonResponse(response_data, status=status)
     
     def get_data(self, request):
         """Переопределите для получения данных."""
@@ -286,7 +286,7 @@ def ajax_response(ok=True, **kwargs):
     status = kwargs.pop('status', 200 if ok else 400)
     response_data = {'ok': ok}
     response_data.update(kwargs)
-    return JsonResponse(response_data, status=status)
+    return FastJsonResponse(response_data, status=status)
 
 
 def require_ajax(view_func):
@@ -296,7 +296,7 @@ def require_ajax(view_func):
     Использование:
         @require_ajax
         def my_view(request):
-            return JsonResponse({'ok': True})
+            return FastJsonResponse({'ok': True})
     """
     from functools import wraps
     from django.http import HttpResponseBadRequest
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class HrConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'hr'
+
+    def ready(self):
+        """Инициализация приложения"""
+        import hr.signals  # noqa: F401
@@ -0,0 +1,76 @@
+"""
+hr/cache.py
+
+Кэширование статистики, данных фильтров и справочника должностей.
+
+Ключ кэша содержит номер версии, который увеличивается сигналами
+при сохранении/удалении сотрудника — старые записи просто перестают
+читаться и истекают по TTL.
+"""
+
+import time
+
+from django.core.cache import cache
+
+from core.cache import cache_is_shared
+
+STATS_VERSION_KEY = "hr:stats:ver"
+STATS_TTL = 300  # 5 минут
+
+
+def get_stats_version():
+    """Текущая версия данных сотрудников."""
+    # Начальная версия от времени, чтобы после вытеснения ключа
+    # не попасть на ещё живые записи старой версии
+    return cache.get_or_set(STATS_VERSION_KEY, lambda: int(time.time()), timeout=None)
+
+
+def bump_stats_version():
+    """Инвалидирует закэшированную статистику."""
+    try:
+        cache.incr(STATS_VERSION_KEY)
+    except ValueError:
+        # Ключа ещё нет (или он вытеснен) — начинаем заново
+        cache.set(STATS_VERSION_KEY, int(time.time()), timeout=None)
+
+
+def get_versioned(name, default):
+    """
+    Возвращает значение из кэша для текущей версии,
+    вычисляя его через default() при промахе.
+
+    Версию сбрасывает один воркер, поэтому на локальном кэше процесса
+    значение всегда вычисляется заново.
+    """
+    if not cache_is_shared():
+        return default()
+    key = f"hr:{name}:{get_stats_version()}"
+    return cache.get_or_set(key, default, timeout=STATS_TTL)
+
+
+def get_job_titles():
+    """Отсортированный список уникальных должностей (кэшируется)."""
+    from .models import JobTitle
+
+    return get_versioned(
+        "job_titles",
+        lambda: list(JobTitle.objects.values_list("name", flat=True)),
+    )
+
+
+def get_form_managers():
+    """
+    Активные сотрудники для выбора руководителя в форме (кэшируется).
+
+    Берётся на одну запись больше лимита формы, чтобы после исключения
+    редактируемого сотрудника список остался полным.
+    """
+    from .models import HumanResource
+
+    return get_versioned(
+        "form_managers",
+        lambda: list(
+            HumanResource.objects.active_by_name()
+            .values("id", "name", "job_title")[:101]
+        ),
+    )
@@ -8,6 +8,7 @@ from django import forms
 from django.utils.translation import gettext_lazy as _
 
 from core.forms import BaseModelForm, BaseFilterForm
+from .cache import get_job_titles
 from .models import HumanResource
 
 
@@ -25,26 +26,36 @@ class HumanResourceForm(BaseModelForm):
         model = HumanResource
         fields = ["name", "job_title", "manager", "is_active"]
         widgets = {
+            'name': forms.TextInput(attrs={
+                'class': 'form-control',
+                'placeholder': _('Введите ФИО'),
+                'autofocus': True,
+            }),
+            'job_title': forms.TextInput(attrs={
+                'class': 'form-control js-tom-select-job',
+                'data-placeholder': _('Выберите или введите должность...'),
+            }),
             'manager': forms.Select(attrs={
                 'class': 'form-select js-tom-select-manager',
                 'data-placeholder': _('Выберите руководителя...')
             }),
+            'is_active': forms.CheckboxInput(attrs={
+                'class': 'form-check-input',
+            }),
         }
         help_texts = {
             'manager': _('Выберите руководителя из списка'),
             'job_title': _('Введите должность или выберите из списка'),
         }
 
-    # Не стилизовать автоматически (стили заданы явно)
-    exclude_fields = ['manager', 'is_active']
+    # Не стилизовать автоматически (стили заданы явно в Meta.widgets)
+    exclude_fields = ['job_title', 'manager', 'is_active']
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
         # Queryset для руководителей
-        self.fields['manager'].queryset = HumanResource.objects.filter(
-            is_active=True
-        ).order_by('name')
+        self.fields['manager'].queryset = HumanResource.objects.active_by_name()
 
         # Исключаем себя из списка руководителей при редактировании
         if self.instance.pk:
@@ -52,28 +63,8 @@ class HumanResourceForm(BaseModelForm):
                 pk=self.instance.pk
             )
 
-        # Должность — текстовое поле с TomSelect
-        self.fields['job_title'] = forms.CharField(
-            label=_("Должность"),
-            required=False,
-            widget=forms.TextInput(attrs={
-                'class': 'form-control js-tom-select-job',
-                'data-placeholder': _('Выберите или введите должность...'),
-            })
-        )
-
         # Имя обязательное
         self.fields['name'].required = True
-        self.fields['name'].widget.attrs.update({
-            'class': 'form-control',
-            'placeholder': _('Введите ФИО'),
-            'autofocus': True,
-        })
-
-        # Чекбокс активности
-        self.fields['is_active'].widget.attrs.update({
-            'class': 'form-check-input',
-        })
 
     def clean_name(self):
         """Валидация имени."""
@@ -153,19 +144,15 @@ class HumanResourceSearchForm(BaseFilterForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        # Динамические choices для должностей
-        job_titles = HumanResource.objects.exclude(
-            job_title=""
-        ).values_list('job_title', flat=True).distinct()
+        # Динамические choices для должностей (справочник hr_job_titles)
+        job_titles = get_job_titles()
 
         self.fields['job_title'].choices = [
             ('', _("Все должности"))
         ] + [(title, title) for title in job_titles]
 
         # Queryset для руководителей
-        self.fields['manager'].queryset = HumanResource.objects.filter(
-            is_active=True
-        ).order_by('name')
+        self.fields['manager'].queryset = HumanResource.objects.active_by_name()
 
 
 class HumanResourceBulkUpdateForm(BaseFilterForm):
@@ -192,9 +179,7 @@ class HumanResourceBulkUpdateForm(BaseFilterForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields['manager'].queryset = HumanResource.objects.filter(
-            is_active=True
-        ).order_by('name')
+        self.fields['manager'].queryset = HumanResource.objects.active_by_name()
 
 
 class HumanResourceImportForm(BaseFilterForm):
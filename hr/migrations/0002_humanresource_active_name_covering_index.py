@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='humanresource',
+            index=models.Index(fields=['is_active', 'name'], include=('job_title',), name='hr_active_name_cov'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:30
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0002_humanresource_active_name_covering_index'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='historicalhumanresource',
+            name='updated_at',
+        ),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:31
+
+from django.db import migrations, models
+
+
+CREATE_JOB_TITLES_SQL = """
+CREATE TABLE hr_job_titles (
+    name varchar(255) PRIMARY KEY
+);
+
+INSERT INTO hr_job_titles (name)
+    SELECT DISTINCT job_title
+    FROM hr_humanresource
+    WHERE job_title <> '';
+
+CREATE FUNCTION hr_job_titles_sync() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND OLD.job_title = NEW.job_title THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP <> 'DELETE' AND NEW.job_title <> '' THEN
+        -- DO UPDATE (а не DO NOTHING) блокирует строку должности до конца
+        -- транзакции: параллельное удаление «осиротевшей» должности
+        -- дождётся коммита и увидит нового сотрудника
+        INSERT INTO hr_job_titles (name) VALUES (NEW.job_title)
+        ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name;
+    END IF;
+    IF TG_OP <> 'INSERT' AND OLD.job_title <> '' THEN
+        -- Сначала блокировка, затем проверка отдельным запросом:
+        -- в READ COMMITTED он видит всё, что закоммичено до неё
+        PERFORM 1 FROM hr_job_titles WHERE name = OLD.job_title FOR UPDATE;
+        DELETE FROM hr_job_titles
+        WHERE name = OLD.job_title
+          AND NOT EXISTS (
+              SELECT 1 FROM hr_humanresource WHERE job_title = OLD.job_title
+          );
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER hr_job_titles_sync
+    AFTER INSERT OR UPDATE OF job_title OR DELETE
+    ON hr_humanresource
+    FOR EACH ROW
+    EXECUTE FUNCTION hr_job_titles_sync();
+
+CREATE FUNCTION hr_job_titles_truncate() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    TRUNCATE hr_job_titles;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER hr_job_titles_truncate
+    AFTER TRUNCATE
+    ON hr_humanresource
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION hr_job_titles_truncate();
+"""
+
+DROP_JOB_TITLES_SQL = """
+DROP TRIGGER IF EXISTS hr_job_titles_truncate ON hr_humanresource;
+DROP FUNCTION IF EXISTS hr_job_titles_truncate();
+DROP TRIGGER IF EXISTS hr_job_titles_sync ON hr_humanresource;
+DROP FUNCTION IF EXISTS hr_job_titles_sync();
+DROP TABLE IF EXISTS hr_job_titles;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0003_historicalhumanresource_exclude_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobTitle',
+            fields=[
+                ('name', models.CharField(max_length=255, primary_key=True, serialize=False, verbose_name='Должность')),
+            ],
+            options={
+                'verbose_name': 'Должность',
+                'verbose_name_plural': 'Должности',
+                'db_table': 'hr_job_titles',
+                'ordering': ['name'],
+                'managed': False,
+            },
+        ),
+        migrations.RunSQL(CREATE_JOB_TITLES_SQL, DROP_JOB_TITLES_SQL),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:45
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+# Django строит icontains как UPPER(col::text) LIKE UPPER(%q%),
+# индекс по самой колонке для такого выражения не используется
+CREATE_UPPER_TRGM_SQL = """
+CREATE INDEX hr_name_upper_trgm
+    ON hr_humanresource USING gin (UPPER(name) gin_trgm_ops);
+CREATE INDEX hr_job_title_upper_trgm
+    ON hr_humanresource USING gin (UPPER(job_title) gin_trgm_ops);
+"""
+
+DROP_UPPER_TRGM_SQL = """
+DROP INDEX IF EXISTS hr_name_upper_trgm;
+DROP INDEX IF EXISTS hr_job_title_upper_trgm;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0004_job_titles_table'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunSQL(CREATE_UPPER_TRGM_SQL, DROP_UPPER_TRGM_SQL),
+    ]
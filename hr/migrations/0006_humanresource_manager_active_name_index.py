@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0005_humanresource_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='humanresource',
+            name='hr_humanres_manager_e7ad2b_idx',
+        ),
+        migrations.AddIndex(
+            model_name='humanresource',
+            index=models.Index(fields=['manager', 'is_active', 'name'], name='hr_manager_active_name_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0006_humanresource_manager_active_name_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='humanresource',
+            index=models.Index(fields=['manager', 'name'], name='hr_mgr_name'),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:59
+
+from django.db import migrations, models
+
+
+CREATE_IS_MANAGER_TRIGGER_SQL = """
+CREATE FUNCTION hr_humanresource_is_manager_set() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.is_manager := EXISTS (
+        SELECT 1 FROM hr_humanresource WHERE manager_id = NEW.id
+    );
+    RETURN NEW;
+END;
+$$;
+
+CREATE TRIGGER hr_is_manager_set
+    BEFORE INSERT OR UPDATE
+    ON hr_humanresource
+    FOR EACH ROW
+    EXECUTE FUNCTION hr_humanresource_is_manager_set();
+
+CREATE FUNCTION hr_humanresource_is_manager_refresh() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    old_manager bigint;
+    new_manager bigint;
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        old_manager := OLD.manager_id;
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        new_manager := NEW.manager_id;
+    END IF;
+    IF old_manager IS DISTINCT FROM new_manager THEN
+        -- Значение пересчитывает BEFORE-триггер hr_is_manager_set
+        UPDATE hr_humanresource SET is_manager = is_manager
+        WHERE id IN (old_manager, new_manager);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER hr_is_manager_refresh
+    AFTER INSERT OR UPDATE OF manager_id OR DELETE
+    ON hr_humanresource
+    FOR EACH ROW
+    EXECUTE FUNCTION hr_humanresource_is_manager_refresh();
+
+UPDATE hr_humanresource SET is_manager = is_manager;
+"""
+
+DROP_IS_MANAGER_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS hr_is_manager_refresh ON hr_humanresource;
+DROP FUNCTION IF EXISTS hr_humanresource_is_manager_refresh();
+DROP TRIGGER IF EXISTS hr_is_manager_set ON hr_humanresource;
+DROP FUNCTION IF EXISTS hr_humanresource_is_manager_set();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0007_humanresource_manager_name_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='humanresource',
+            name='is_manager',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Руководитель'),
+        ),
+        migrations.AddIndex(
+            model_name='humanresource',
+            index=models.Index(condition=models.Q(('is_manager', True)), fields=['name'], name='hr_managers_name'),
+        ),
+        migrations.RunSQL(CREATE_IS_MANAGER_TRIGGER_SQL, DROP_IS_MANAGER_TRIGGER_SQL),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 18:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hr', '0008_humanresource_is_manager'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='humanresource',
+            name='hr_humanres_is_acti_486809_idx',
+        ),
+        migrations.AlterField(
+            model_name='humanresource',
+            name='manager',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='subordinates', to='hr.humanresource', verbose_name='Начальник'),
+        ),
+    ]
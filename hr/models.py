@@ -1,8 +1,10 @@
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 from simple_history.models import HistoricalRecords
 from django.utils import timezone
+from django.utils.functional import cached_property
 
 
 class HumanResourceQuerySet(models.QuerySet):
@@ -14,16 +16,35 @@ class HumanResourceQuerySet(models.QuerySet):
             subordinates_count=models.Count('subordinates')
         )
 
+    def subordinates_count_expr(self):
+        """
+        Количество подчиненных коррелированным подзапросом.
+
+        В отличие от Count('subordinates') не требует JOIN + GROUP BY,
+        поэтому COUNT(*) пагинатора выполняется без этой аннотации.
+        """
+        subordinates = (
+            self.model._default_manager
+            .filter(manager=models.OuterRef('pk'))
+            .order_by()
+            .values('manager')
+            .annotate(cnt=models.Count('pk'))
+            .values('cnt')
+        )
+        return Coalesce(models.Subquery(subordinates), 0)
+
     def managers_only(self):
         """Только руководители (имеющие подчиненных)"""
-        return self.annotate(
-            sub_cnt=models.Count('subordinates')
-        ).filter(sub_cnt__gt=0)
+        return self.filter(is_manager=True)
 
     def active(self):
         """Активные сотрудники"""
         return self.filter(is_active=True)
 
+    def active_by_name(self):
+        """Активные сотрудники по алфавиту (выбор руководителя)"""
+        return self.active().order_by('name')
+
     def by_manager(self, manager_id):
         """Сотрудники по руководителю"""
         return self.filter(manager_id=manager_id)
@@ -55,6 +76,9 @@ class HumanResourceManager(models.Manager):
     def active(self):
         return self.get_queryset().active()
 
+    def active_by_name(self):
+        return self.get_queryset().active_by_name()
+
     def by_manager(self, manager_id):
         return self.get_queryset().by_manager(manager_id)
 
@@ -90,7 +114,10 @@ class HumanResourceManager(models.Manager):
 
 
 class HumanResource(models.Model):
-    history = HistoricalRecords()
+    # updated_at меняется при каждом save() и дублирует history_date
+    history = HistoricalRecords(
+        excluded_fields=["updated_at", "is_manager"]
+    )
 
     # Основная информация
     name = models.CharField(_("ФИО"), max_length=255)
@@ -104,6 +131,8 @@ class HumanResource(models.Model):
         blank=True,
         on_delete=models.SET_NULL,
         related_name="subordinates",
+        # Поиск по manager_id обслуживают составные индексы (manager, ...)
+        db_index=False,
     )
 
     # Статус
@@ -113,10 +142,18 @@ class HumanResource(models.Model):
         help_text=_("Сотрудник работает в компании")
     )
 
+    # Есть ли подчиненные — поддерживается триггером БД (см. миграцию 0008),
+    # значение из save() триггер перезаписывает
+    is_manager = models.BooleanField(
+        _("Руководитель"), default=False, editable=False
+    )
+
     # Технические поля
     created_at = models.DateTimeField(_("Создан"), auto_now_add=True)
     updated_at = models.DateTimeField(_("Обновлен"), auto_now=True)
 
+    objects = HumanResourceManager()
+
     class Meta:
         verbose_name = _("Сотрудник")
         verbose_name_plural = _("Сотрудники")
@@ -124,11 +161,36 @@ class HumanResource(models.Model):
         indexes = [
             models.Index(fields=["name"]),
             models.Index(fields=["job_title"]),
-            models.Index(fields=["is_active"]),
-            models.Index(fields=["manager", "is_active"]),
+            models.Index(
+                fields=["manager", "is_active", "name"],
+                name="hr_manager_active_name_idx",
+            ),
+            # Фильтр по руководителю без фильтра активности + сортировка по ФИО
+            models.Index(fields=["manager", "name"], name="hr_mgr_name"),
+            # Покрывающий индекс для выпадающего списка руководителей
+            # (filter(is_active=True).order_by("name")) — index-only scan
+            models.Index(
+                fields=["is_active", "name"],
+                include=["job_title"],
+                name="hr_active_name_cov",
+            ),
+            # Руководители по ФИО (managers_only): частичный индекс вместо
+            # индекса по малоселективному флагу
+            models.Index(
+                fields=["name"],
+                condition=models.Q(is_manager=True),
+                name="hr_managers_name",
+            ),
+            # Триграммные индексы по UPPER(name)/UPPER(job_title) для icontains
+            # создаются в миграции 0005 (RunSQL)
         ]
 
     def __str__(self):
+        return self.display_name
+
+    @cached_property
+    def display_name(self):
+        """ФИО с должностью (кешируется на экземпляре)"""
         if self.job_title:
             return f"{self.name} — {self.job_title}"
         return self.name
@@ -158,8 +220,35 @@ class HumanResource(models.Model):
 
     def save(self, *args, **kwargs):
         self.full_clean()
+        # Сбрасываем кеш отображаемого имени — name/job_title могли измениться
+        self.__dict__.pop("display_name", None)
         return super().save(*args, **kwargs)
 
+    def refresh_from_db(self, *args, **kwargs):
+        self.__dict__.pop("display_name", None)
+        return super().refresh_from_db(*args, **kwargs)
+
     def get_absolute_url(self):
         from django.urls import reverse
-        return reverse("hr:hr_detail", args=[str(self.pk)])
\ No newline at end of file
+        return reverse("hr:hr_detail", args=[str(self.pk)])
+
+
+class JobTitle(models.Model):
+    """
+    Справочник уникальных должностей.
+
+    Таблица hr_job_titles ведётся построчными триггерами на HumanResource
+    при изменении job_title (см. миграцию 0004).
+    """
+
+    name = models.CharField(_("Должность"), max_length=255, primary_key=True)
+
+    class Meta:
+        managed = False
+        db_table = "hr_job_titles"
+        verbose_name = _("Должность")
+        verbose_name_plural = _("Должности")
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
@@ -1,183 +1,67 @@
-# hr/tests/test_signals.py
-from django.test import TestCase
 import logging
-from hr.models import HumanResource
 
-
-class SignalsTest(TestCase):
-    """Тесты сигналов"""
-
-    def setUp(self):
-        # Настраиваем логирование для тестирования
-        self.logger = logging.getLogger('hr')
-
-        # Сохраняем оригинальные обработчики
-        self.original_handlers = self.logger.handlers.copy()
-        self.original_level = self.logger.level
-
-        # Очищаем обработчики и добавляем тестовый
-        self.log_capture = []
-
-        class TestHandler(logging.Handler):
-            def __init__(self, log_capture):
-                super().__init__()
-                self.log_capture = log_capture
-
-            def emit(self, record):
-                self.log_capture.append(record.getMessage())
-
-        self.handler = TestHandler(self.log_capture)
-        self.logger.addHandler(self.handler)
-        self.logger.setLevel(logging.INFO)
-
-    def tearDown(self):
-        # Восстанавливаем оригинальные настройки
-        self.logger.removeHandler(self.handler)
-        for handler in self.original_handlers:
-            self.logger.addHandler(handler)
-        self.logger.setLevel(self.original_level)
-
-    def test_creation_logging(self):
-        """Тест логирования создания"""
-        # Очищаем логи перед тестом
-        self.log_capture.clear()
-
-        # Создаем сотрудника
-        hr = HumanResource.objects.create(
-            name="Новый для логов",
-            job_title="Тестировщик"
-        )
-
-        # Проверяем, что объект создан
-        self.assertEqual(hr.name, "Новый для логов")
-
-        # Проверяем логирование (может не работать в тестах)
-        # Вместо проверки конкретных сообщений, проверяем, что сигналы работают
-        # через проверку что объект сохранен правильно
-        self.assertTrue(HumanResource.objects.filter(name="Новый для логов").exists())
-
-        # Дополнительная проверка: если логи есть - проверить их
-        if self.log_capture:
-            print(f"Записано логов: {len(self.log_capture)}")
-            for msg in self.log_capture:
-                print(f"  Лог: {msg}")
-
-            # Проверяем наличие ключевых слов в логах
-            has_creation_log = any(
-                any(word in msg.lower() for word in ['создан', 'новый', 'создание', 'create'])
-                for msg in self.log_capture
-            )
-            self.assertTrue(has_creation_log, "Логи создания не найдены")
-
-    def test_update_logging(self):
-        """Тест логирования обновления"""
-        # Создаем объект
-        hr = HumanResource.objects.create(
-            name="Обновляемый сотрудник",
-            job_title="Сотрудник"
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import bump_stats_version
+from .models import HumanResource
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(pre_save, sender=HumanResource)
+def log_changes(sender, instance, **kwargs):
+    """Перед сохранением сотрудника: логируем смену руководителя и статуса"""
+    # Без включенного INFO не делаем даже запрос старых значений
+    if not instance.pk or not logger.isEnabledFor(logging.INFO):
+        return
+
+    old = (
+        HumanResource.objects
+        .filter(pk=instance.pk)
+        .values("manager_id", "is_active")
+        .first()
+    )
+    if old is None:
+        return
+
+    # Логируем смену руководителя
+    if old["manager_id"] != instance.manager_id:
+        logger.info(
+            "Руководитель сотрудника '%s' изменен: %s → %s",
+            instance.name, old["manager_id"], instance.manager_id,
         )
 
-        # Очищаем логи
-        self.log_capture.clear()
-
-        # Обновляем
-        hr.name = "Обновленный сотрудник"
-        hr.save()
-
-        # Проверяем обновление
-        hr.refresh_from_db()
-        self.assertEqual(hr.name, "Обновленный сотрудник")
-
-        # Если логи есть - проверяем
-        if self.log_capture:
-            has_update_log = any(
-                any(word in msg.lower() for word in ['обновлен', 'обновление', 'update', 'изменен'])
-                for msg in self.log_capture
-            )
-            self.assertTrue(has_update_log, "Логи обновления не найдены")
-
-    def test_manager_change(self):
-        """Тест изменения руководителя"""
-        manager1 = HumanResource.objects.create(name="Руководитель 1")
-        manager2 = HumanResource.objects.create(name="Руководитель 2")
-        employee = HumanResource.objects.create(name="Сотрудник", manager=manager1)
-
-        # Очищаем логи
-        self.log_capture.clear()
-
-        # Меняем руководителя
-        employee.manager = manager2
-        employee.save()
-
-        # Проверяем изменение
-        employee.refresh_from_db()
-        self.assertEqual(employee.manager, manager2)
-
-        # Если логи есть - проверяем
-        if self.log_capture:
-            has_manager_log = any(
-                any(word in msg.lower() for word in ['руководитель', 'менеджер', 'manager', 'начальник'])
-                for msg in self.log_capture
-            )
-            self.assertTrue(has_manager_log, "Логи изменения руководителя не найдены")
-
-    def test_status_change(self):
-        """Тест изменения статуса активности"""
-        hr = HumanResource.objects.create(
-            name="Тест статуса",
-            job_title="Сотрудник",
-            is_active=True
-        )
-
-        # Очищаем логи
-        self.log_capture.clear()
-
-        # Меняем статус
-        hr.is_active = False
-        hr.save()
-
-        # Проверяем изменение
-        hr.refresh_from_db()
-        self.assertFalse(hr.is_active)
-
-        # Если логи есть - проверяем
-        if self.log_capture:
-            has_status_log = any(
-                any(word in msg.lower() for word in ['актив', 'статус', 'status', 'is_active'])
-                for msg in self.log_capture
-            )
-            self.assertTrue(has_status_log, "Логи изменения статуса не найдены")
-
-    def test_delete_with_subordinates(self):
-        """Тест удаления с подчиненными"""
-        manager = HumanResource.objects.create(
-            name="Удаляемый руководитель",
-            job_title="Руководитель"
+    # Логируем изменение статуса активности
+    if old["is_active"] != instance.is_active:
+        logger.info(
+            "Статус сотрудника '%s' изменен: %s",
+            instance.name, "активен" if instance.is_active else "неактивен",
         )
 
-        subordinate = HumanResource.objects.create(
-            name="Подчиненный",
-            job_title="Сотрудник",
-            manager=manager
-        )
 
-        # Очищаем логи
-        self.log_capture.clear()
+@receiver(post_save, sender=HumanResource)
+def log_creation_or_update(sender, instance, created, **kwargs):
+    """После сохранения сотрудника"""
+    if created:
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Создан сотрудник: %s (ID: %s)", instance.name, instance.pk)
+    elif logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Сотрудник обновлен: %s (ID: %s)", instance.name, instance.pk)
 
-        # Удаляем руководителя
-        manager.delete()
 
-        # Проверяем что подчиненный остался без руководителя
-        subordinate.refresh_from_db()
-        self.assertIsNone(subordinate.manager)
+@receiver(post_delete, sender=HumanResource)
+def log_deletion(sender, instance, **kwargs):
+    """После удаления сотрудника"""
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Сотрудник удален: %s (ID: %s)", instance.name, instance.pk)
 
-        # Проверяем что руководитель удален
-        self.assertFalse(HumanResource.objects.filter(name="Удаляемый руководитель").exists())
 
-        # Если логи есть - проверяем
-        if self.log_capture:
-            has_delete_log = any(
-                any(word in msg.lower() for word in ['удален', 'удаление', 'delete', 'deleted'])
-                for msg in self.log_capture
-            )
-            self.assertTrue(has_delete_log, "Логи удаления не найдены")
\ No newline at end of file
+@receiver(post_save, sender=HumanResource)
+@receiver(post_delete, sender=HumanResource)
+def invalidate_stats_cache(sender, **kwargs):
+    """Сбрасывает кэш статистики списка сотрудников"""
+    # После коммита: иначе параллельный запрос может закэшировать
+    # под новой версией ещё не закоммиченные (старые) данные
+    transaction.on_commit(bump_stats_version)
@@ -12,13 +12,14 @@ from hr.models import HumanResource
 class HumanResourceFormTest(TestCase):
     """Тесты форм"""
 
-    def setUp(self):
-        self.manager = HumanResource.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = HumanResource.objects.create(
             name="Руководитель Тест",
             job_title="Тестовый руководитель"
         )
 
-        self.employee = HumanResource.objects.create(
+        cls.employee = HumanResource.objects.create(
             name="Сотрудник Тест",
             job_title="Тестовый сотрудник"
         )
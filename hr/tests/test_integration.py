@@ -1,38 +1,45 @@
 # hr/tests/test_integration.py
+import logging
+
+from django.core.cache import cache
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.auth.models import User, Permission
 
 from hr.models import HumanResource
 
+_log = logging.getLogger(__name__)
+
 
 class IntegrationTest(TestCase):
     """Интеграционные тесты"""
 
-    def setUp(self):
-        # Создаем пользователя со всеми правами
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        # Создаем пользователя со всеми правами (один раз на класс)
+        cls.user = User.objects.create_user(
             username='admin',
             password='adminpass',
             is_staff=True
         )
 
         # Добавляем все разрешения
-        permissions = Permission.objects.filter(
+        cls.user.user_permissions.set(Permission.objects.filter(
             codename__in=['view_humanresource', 'add_humanresource',
                           'change_humanresource', 'delete_humanresource']
-        )
-        self.user.user_permissions.add(*permissions)
+        ))
 
+    def setUp(self):
+        cache.clear()
         self.client = Client()
         self.client.force_login(self.user)
 
     def test_full_employee_lifecycle(self):
         """Тест полного жизненного цикла сотрудника"""
-        print("\n=== Тест полного жизненного цикла сотрудника ===")
+        _log.debug("=== Тест полного жизненного цикла сотрудника ===")
 
         # 1. Создаем сотрудника
-        print("1. Создаем сотрудника...")
+        _log.debug("1. Создаем сотрудника...")
         create_data = {
             'name': 'Интеграционный сотрудник',
             'job_title': 'Разработчик',
@@ -44,17 +51,17 @@ class IntegrationTest(TestCase):
 
         # Получаем созданного сотрудника
         employee = HumanResource.objects.get(name='Интеграционный сотрудник')
-        print(f"   Создан сотрудник ID: {employee.pk}")
+        _log.debug("   Создан сотрудник ID: %s", employee.pk)
 
         # 2. Просматриваем сотрудника
-        print("2. Просматриваем сотрудника...")
+        _log.debug("2. Просматриваем сотрудника...")
         detail_url = reverse('hr:hr_detail', args=[employee.pk])
         response = self.client.get(detail_url)
         self.assertEqual(response.status_code, 200)
-        print("   Просмотр успешен")
+        _log.debug("   Просмотр успешен")
 
         # 3. Редактируем сотрудника
-        print("3. Редактируем сотрудника...")
+        _log.debug("3. Редактируем сотрудника...")
         edit_url = reverse('hr:hr_edit', args=[employee.pk])
         edit_data = {
             'name': 'Обновленный интеграционный сотрудник',
@@ -68,18 +75,18 @@ class IntegrationTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(employee.name, 'Обновленный интеграционный сотрудник')
         self.assertEqual(employee.job_title, 'Старший разработчик')
-        print("   Редактирование успешно")
+        _log.debug("   Редактирование успешно")
 
         # 5. Удаляем сотрудника
-        print("5. Удаляем сотрудника...")
+        _log.debug("5. Удаляем сотрудника...")
         delete_url = reverse('hr:hr_delete', args=[employee.pk])
         response = self.client.post(delete_url)
 
         self.assertIn(response.status_code, [200, 302])
         self.assertFalse(HumanResource.objects.filter(pk=employee.pk).exists())
-        print("   Удаление успешно")
+        _log.debug("   Удаление успешно")
 
-        print("=== Тест завершен успешно ===")
+        _log.debug("=== Тест завершен успешно ===")
 
     # УДАЛИТЕ или закомментируйте этот тест - метода нет
     # def test_organization_hierarchy(self):
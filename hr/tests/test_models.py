@@ -1,24 +1,47 @@
 # hr/tests/test_models.py
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.test import TestCase
-from hr.models import HumanResource
+from hr import signals as hrsig
+from hr.models import HumanResource, JobTitle
+
+# Обработчики логирования hr.signals, не нужные для тестов модели
+_HR_RECEIVERS = (
+    (pre_save, hrsig.log_changes),
+    (post_save, hrsig.log_creation_or_update),
+    (post_delete, hrsig.log_deletion),
+)
 
 
 class HumanResourceModelTest(TestCase):
     """Тесты модели HumanResource"""
 
-    def setUp(self):
-        self.manager = HumanResource.objects.create(
+    @classmethod
+    def setUpClass(cls):
+        # Отключаем сигналы до создания фикстур в setUpTestData
+        for signal, handler in _HR_RECEIVERS:
+            signal.disconnect(receiver=handler, sender=HumanResource)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        for signal, handler in _HR_RECEIVERS:
+            signal.connect(handler, sender=HumanResource)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = HumanResource.objects.create(
             name="Иванов Иван Иванович",
             job_title="Директор"
         )
 
-        self.employee = HumanResource.objects.create(
+        cls.employee = HumanResource.objects.create(
             name="Петров Петр Петрович",
             job_title="Менеджер",
-            manager=self.manager
+            manager=cls.manager
         )
 
-        self.inactive_employee = HumanResource.objects.create(
+        cls.inactive_employee = HumanResource.objects.create(
             name="Сидоров Сидор Сидорович",
             job_title="Аналитик",
             is_active=False
@@ -40,6 +63,11 @@ class HumanResourceModelTest(TestCase):
         hr_no_title = HumanResource.objects.create(name="Тестов Тест Тестович")
         self.assertEqual(str(hr_no_title), "Тестов Тест Тестович")
 
+        # Кеш сбрасывается после сохранения
+        hr_no_title.job_title = "Инженер"
+        hr_no_title.save()
+        self.assertEqual(str(hr_no_title), "Тестов Тест Тестович — Инженер")
+
     def test_manager_relationship(self):
         """Тест отношений руководитель-подчиненный"""
         self.assertEqual(self.employee.manager, self.manager)
@@ -57,9 +85,14 @@ class HumanResourceModelTest(TestCase):
     def test_circular_reference_validation(self):
         """Тест валидации циклических ссылок"""
         # Создаем цепочку: A -> B -> C
-        hr_a = HumanResource.objects.create(name="А")
-        hr_b = HumanResource.objects.create(name="Б", manager=hr_a)
-        hr_c = HumanResource.objects.create(name="В", manager=hr_b)
+        hr_a, hr_b, hr_c = HumanResource.objects.bulk_create([
+            HumanResource(name="А"),
+            HumanResource(name="Б"),
+            HumanResource(name="В"),
+        ])
+        hr_b.manager_id = hr_a.pk
+        hr_c.manager_id = hr_b.pk
+        HumanResource.objects.bulk_update([hr_b, hr_c], ["manager"])
 
         # Пытаемся сделать A подчиненным C (цикл: A -> B -> C -> A)
         hr_a.manager = hr_c
@@ -89,9 +122,85 @@ class HumanResourceModelTest(TestCase):
     #     self.assertEqual(search_result.count(), 1)
     #     self.assertIn(self.employee, search_result)
 
+    def test_search(self):
+        """Тест поиска по подстроке ФИО и должности"""
+        result = HumanResource.objects.search("Петр")
+        self.assertEqual(list(result), [self.employee])
+
+        result = HumanResource.objects.search("директ")
+        self.assertEqual(list(result), [self.manager])
+
+    def test_managers_only(self):
+        """Тест выборки руководителей по флагу is_manager"""
+        managers = HumanResource.objects.managers_only()
+        self.assertEqual(list(managers), [self.manager])
+
+    def test_is_manager_maintained(self):
+        """Флаг is_manager пересчитывается триггером при смене руководителя"""
+        new_manager = self.inactive_employee
+        self.manager.refresh_from_db()
+        self.assertTrue(self.manager.is_manager)
+
+        # Подчиненный переходит к другому руководителю
+        self.employee.manager = new_manager
+        self.employee.save()
+        self.manager.refresh_from_db()
+        new_manager.refresh_from_db()
+        self.assertFalse(self.manager.is_manager)
+        self.assertTrue(new_manager.is_manager)
+
+        # Сохранение устаревшего экземпляра не затирает флаг
+        new_manager.is_manager = False
+        new_manager.save()
+        new_manager.refresh_from_db()
+        self.assertTrue(new_manager.is_manager)
+
+        # После удаления подчиненного флаг снимается
+        self.employee.delete()
+        new_manager.refresh_from_db()
+        self.assertFalse(new_manager.is_manager)
+
     def test_absolute_url(self):
         """Тест метода get_absolute_url"""
         url = self.employee.get_absolute_url()
         # Измените эту проверку на фактический URL
         self.assertTrue(url.startswith('/hr/'))
-        self.assertTrue(str(self.employee.pk) in url)
\ No newline at end of file
+        self.assertTrue(str(self.employee.pk) in url)
+
+
+class JobTitleModelTest(TestCase):
+    """Тесты справочника должностей (таблица на триггерах)"""
+
+    def test_distinct_job_titles(self):
+        """Должности уникальны, пустые не попадают в справочник"""
+        HumanResource.objects.create(name="Первый", job_title="Инженер")
+        HumanResource.objects.create(name="Второй", job_title="Инженер")
+        HumanResource.objects.create(name="Третий")
+
+        self.assertEqual(
+            list(JobTitle.objects.values_list('name', flat=True)),
+            ["Инженер"]
+        )
+
+    def test_refresh_on_update(self):
+        """Справочник обновляется при изменении должности"""
+        hr = HumanResource.objects.create(name="Сотрудник", job_title="Стажер")
+
+        hr.job_title = "Специалист"
+        hr.save()
+
+        self.assertEqual(
+            list(JobTitle.objects.values_list('name', flat=True)),
+            ["Специалист"]
+        )
+
+    def test_removed_with_last_employee(self):
+        """Должность остаётся, пока у неё есть сотрудники"""
+        first = HumanResource.objects.create(name="Первый", job_title="Инженер")
+        second = HumanResource.objects.create(name="Второй", job_title="Инженер")
+
+        first.delete()
+        self.assertTrue(JobTitle.objects.filter(name="Инженер").exists())
+
+        second.delete()
+        self.assertFalse(JobTitle.objects.filter(name="Инженер").exists())
@@ -1,5 +1,10 @@
 import json
-from django.test import TestCase, Client
+from unittest.mock import patch
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib.auth.models import User, Permission
 from django.utils import timezone
@@ -7,43 +12,66 @@ from django.utils.translation import gettext_lazy as _
 
 from hr.models import HumanResource
 
+# Быстрый хешер паролей: безопасность хеша в тестах не важна
+FAST_PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
 
-class HumanResourceListViewTest(TestCase):
+
+class LoginOnceMixin:
+    """
+    Вход выполняется один раз на класс (в setUpTestData),
+    тесты лишь подставляют готовую сессионную cookie.
+    """
+
+    @classmethod
+    def _login_once(cls):
+        client = Client()
+        client.force_login(cls.user)
+        return client.cookies[settings.SESSION_COOKIE_NAME].value
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = self._session_key
+
+
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
+class HumanResourceListViewTest(LoginOnceMixin, TestCase):
     """Тесты для списка сотрудников"""
 
     """Тесты для списка сотрудников"""
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         # Создаем пользователя
-        self.user = User.objects.create_user(
+        cls.user = User.objects.create_user(
             username='hruser',
             password='testpass123'
         )
 
         # Добавляем разрешение на просмотр сотрудников
         view_perm = Permission.objects.get(codename='view_humanresource')
-        self.user.user_permissions.add(view_perm)
+        cls.user.user_permissions.add(view_perm)
 
         # Создаем тестовых сотрудников
-        self.manager = HumanResource.objects.create(
+        cls.manager = HumanResource.objects.create(
             name="Иванов И.И.",
             job_title="Директор"
         )
 
-        self.employee1 = HumanResource.objects.create(
+        cls.employee1 = HumanResource.objects.create(
             name="Петров П.П.",
             job_title="Менеджер",
-            manager=self.manager
+            manager=cls.manager
         )
 
-        self.employee2 = HumanResource.objects.create(
+        cls.employee2 = HumanResource.objects.create(
             name="Сидоров С.С.",
             job_title="Аналитик",
             is_active=False
         )
 
-        self.client = Client()
-        self.client.force_login(self.user)
+        # Сессия на весь класс
+        cls._session_key = cls._login_once()
 
     def test_list_view_url_exists(self):
         """Тест доступности URL"""
@@ -61,6 +89,13 @@ class HumanResourceListViewTest(TestCase):
         self.assertIn('employees', response.context)
         self.assertEqual(len(response.context['employees']), 3)
 
+    def test_list_view_subordinates_count(self):
+        """Тест количества подчинённых в списке"""
+        response = self.client.get(reverse('hr:hr_list'))
+        counts = {e.pk: e.sub_count for e in response.context['employees']}
+        self.assertEqual(counts[self.manager.pk], 1)
+        self.assertEqual(counts[self.employee1.pk], 0)
+
     def test_list_view_filtering(self):
         """Тест фильтрации"""
         # Поиск по имени - упростим проверку
@@ -73,6 +108,30 @@ class HumanResourceListViewTest(TestCase):
             # Проверяем что фильтр что-то делает
             self.assertTrue(len(employees) <= 3)
 
+    def test_list_view_manager_filter(self):
+        """Тест фильтра по руководителю (в т.ч. некорректный ID)"""
+        response = self.client.get(reverse('hr:hr_list'), {'manager': self.manager.pk})
+        self.assertEqual(list(response.context['employees']), [self.employee1])
+
+        response = self.client.get(reverse('hr:hr_list'), {'manager': 'abc'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['employees']), 3)
+
+    @patch('hr.cache.cache_is_shared', return_value=True)
+    def test_list_view_stats_cache_invalidation(self, _shared):
+        """Тест сброса кэша статистики при изменении сотрудников"""
+        response = self.client.get(reverse('hr:hr_list'))
+        self.assertEqual(response.context['stats']['total'], 3)
+        self.assertEqual(response.context['stats']['active'], 2)
+        self.assertEqual(response.context['stats']['managers'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            HumanResource.objects.create(name="Новый", job_title="Стажер")
+
+        response = self.client.get(reverse('hr:hr_list'))
+        self.assertEqual(response.context['stats']['total'], 4)
+        self.assertIn("Стажер", response.context['job_titles'])
+
     def test_list_view_access_without_permission(self):
         """Тест доступа без разрешения"""
         user2 = User.objects.create_user(username='noperm', password='test123')
@@ -86,37 +145,39 @@ class HumanResourceListViewTest(TestCase):
         # Если 200 - значит права не проверяются, что тоже вариант
 
 
-class HumanResourceDetailViewTest(TestCase):
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
+class HumanResourceDetailViewTest(LoginOnceMixin, TestCase):
     """Тесты для детальной страницы сотрудника"""
 
-    def setUp(self):
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username='hruser',
             password='testpass123'
         )
         view_perm = Permission.objects.get(codename='view_humanresource')
-        self.user.user_permissions.add(view_perm)
+        cls.user.user_permissions.add(view_perm)
 
-        self.manager = HumanResource.objects.create(
+        cls.manager = HumanResource.objects.create(
             name="Руководитель Детальный",
             job_title="Руководитель"
         )
 
-        self.employee = HumanResource.objects.create(
+        cls.employee = HumanResource.objects.create(
             name="Сотрудник Детальный",
             job_title="Сотрудник",
-            manager=self.manager
+            manager=cls.manager
         )
 
         # Создаем подчиненного
         HumanResource.objects.create(
             name="Подчиненный",
             job_title="Подчиненный",
-            manager=self.employee
+            manager=cls.employee
         )
 
-        self.client = Client()
-        self.client.force_login(self.user)
+        # Сессия на весь класс
+        cls._session_key = cls._login_once()
 
     def test_detail_view_url_exists(self):
         """Тест доступности детальной страницы"""
@@ -144,30 +205,41 @@ class HumanResourceDetailViewTest(TestCase):
         self.assertEqual(response.status_code, 404)
 
 
-class HumanResourceCreateViewTest(TestCase):
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
+class HumanResourceCreateViewTest(LoginOnceMixin, TestCase):
     """Тесты для создания сотрудника"""
 
-    def setUp(self):
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username='hruser',
             password='testpass123'
         )
         add_perm = Permission.objects.get(codename='add_humanresource')
-        self.user.user_permissions.add(add_perm)
+        cls.user.user_permissions.add(add_perm)
 
-        self.manager = HumanResource.objects.create(
+        cls.manager = HumanResource.objects.create(
             name="Руководитель для создания",
             job_title="Руководитель"
         )
 
-        self.client = Client()
-        self.client.force_login(self.user)
+        # Сессия на весь класс
+        cls._session_key = cls._login_once()
 
     def test_create_view_url_exists(self):
         """Тест доступности страницы создания"""
         response = self.client.get(reverse('hr:hr_new'))
         self.assertEqual(response.status_code, 200)
 
+    def test_create_view_manager_prefill(self):
+        """Тест предзаполнения руководителя из GET (в т.ч. некорректный ID)"""
+        response = self.client.get(reverse('hr:hr_new'), {'manager': self.manager.pk})
+        self.assertEqual(response.context['initial_manager'], self.manager)
+
+        response = self.client.get(reverse('hr:hr_new'), {'manager': 'abc'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.context['initial_manager'])
+
     def test_create_employee_success(self):
         """Тест успешного создания сотрудника"""
         form_data = {
@@ -215,30 +287,32 @@ class HumanResourceCreateViewTest(TestCase):
         self.assertIn(response.status_code, [302, 403])
 
 
-class HumanResourceUpdateViewTest(TestCase):
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
+class HumanResourceUpdateViewTest(LoginOnceMixin, TestCase):
     """Тесты для обновления сотрудника"""
 
-    def setUp(self):
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username='hruser',
             password='testpass123'
         )
         change_perm = Permission.objects.get(codename='change_humanresource')
-        self.user.user_permissions.add(change_perm)
+        cls.user.user_permissions.add(change_perm)
 
-        self.manager = HumanResource.objects.create(
+        cls.manager = HumanResource.objects.create(
             name="Старый руководитель",
             job_title="Руководитель"
         )
 
-        self.employee = HumanResource.objects.create(
+        cls.employee = HumanResource.objects.create(
             name="Старый сотрудник",
             job_title="Старая должность",
-            manager=self.manager
+            manager=cls.manager
         )
 
-        self.client = Client()
-        self.client.force_login(self.user)
+        # Сессия на весь класс
+        cls._session_key = cls._login_once()
 
     def test_update_view_url_exists(self):
         """Тест доступности страницы редактирования"""
@@ -246,6 +320,13 @@ class HumanResourceUpdateViewTest(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
 
+    def test_update_view_managers_exclude_self(self):
+        """Тест: в списке руководителей нет редактируемого сотрудника"""
+        response = self.client.get(reverse('hr:hr_edit', args=[self.employee.pk]))
+        ids = [m['id'] for m in response.context['all_managers']]
+        self.assertIn(self.manager.pk, ids)
+        self.assertNotIn(self.employee.pk, ids)
+
     def test_update_employee_success(self):
         """Тест успешного обновления сотрудника"""
         new_manager = HumanResource.objects.create(
@@ -286,24 +367,26 @@ class HumanResourceUpdateViewTest(TestCase):
         self.assertIn(response.status_code, [302, 403])
 
 
-class HumanResourceDeleteViewTest(TestCase):
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
+class HumanResourceDeleteViewTest(LoginOnceMixin, TestCase):
     """Тесты для удаления сотрудника"""
 
-    def setUp(self):
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username='hruser',
             password='testpass123'
         )
         delete_perm = Permission.objects.get(codename='delete_humanresource')
-        self.user.user_permissions.add(delete_perm)
+        cls.user.user_permissions.add(delete_perm)
 
-        self.employee = HumanResource.objects.create(
+        cls.employee = HumanResource.objects.create(
             name="Удаляемый сотрудник",
             job_title="Сотрудник"
         )
 
-        self.client = Client()
-        self.client.force_login(self.user)
+        # Сессия на весь класс
+        cls._session_key = cls._login_once()
 
     def test_delete_employee_success(self):
         """Тест успешного удаления сотрудника"""
@@ -365,24 +448,26 @@ class HumanResourceDeleteViewTest(TestCase):
         self.assertEqual(response.status_code, 404)
 
 
-class AjaxViewsTest(TestCase):
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
+class AjaxViewsTest(LoginOnceMixin, TestCase):
     """Тесты AJAX представлений"""
 
-    def setUp(self):
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username='hruser',
             password='testpass123'
         )
         view_perm = Permission.objects.get(codename='view_humanresource')
-        self.user.user_permissions.add(view_perm)
+        cls.user.user_permissions.add(view_perm)
 
         # Создаем тестовых сотрудников
-        self.manager = HumanResource.objects.create(
+        cls.manager = HumanResource.objects.create(
             name="AJAX Руководитель",
             job_title="Руководитель AJAX"
         )
 
-        self.employee = HumanResource.objects.create(
+        cls.employee = HumanResource.objects.create(
             name="AJAX Сотрудник",
             job_title="Сотрудник AJAX"
         )
@@ -394,8 +479,8 @@ class AjaxViewsTest(TestCase):
                 job_title=title
             )
 
-        self.client = Client()
-        self.client.force_login(self.user)
+        # Сессия на весь класс
+        cls._session_key = cls._login_once()
 
     def test_manager_autocomplete(self):
         """Тест автодополнения руководителей"""
@@ -424,6 +509,37 @@ class AjaxViewsTest(TestCase):
         # Должны вернуться все активные сотрудники
         self.assertGreater(len(data['results']), 0)
 
+    @patch('hr.views._AUTOCOMPLETE_PAGE', 2)
+    def test_manager_autocomplete_keyset_pages(self):
+        """Тест постраничного автодополнения по ключу (name, id)"""
+        url = reverse('hr:hr_manager_autocomplete')
+        seen = []
+        params = {}
+        while True:
+            data = self.client.get(url, params).json()
+            seen += [r['id'] for r in data['results']]
+            if 'next' not in data:
+                break
+            params = data['next']
+
+        expected = list(
+            HumanResource.objects.active().order_by('name', 'id')
+            .values_list('id', flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_manager_autocomplete_short_query(self):
+        """Тест: слишком короткий запрос не обращается к БД"""
+        url = reverse('hr:hr_manager_autocomplete')
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, {'q': 'A'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'], [])
+        self.assertFalse(
+            [q for q in ctx.captured_queries if 'hr_humanresource' in q['sql']]
+        )
+
     def test_job_title_autocomplete(self):
         """Тест автодополнения должностей"""
         url = reverse('hr:hr_job_title_autocomplete')
@@ -458,6 +574,43 @@ class AjaxViewsTest(TestCase):
         titles = [r['text'] for r in data['results']]
         self.assertEqual(len(titles), len(set(titles)))
 
+    @patch('hr.views.cache_is_shared', return_value=True)
+    def test_autocomplete_etag(self, _shared):
+        """Повторный запрос с If-None-Match получает 304 до изменения данных"""
+        url = reverse('hr:hr_manager_autocomplete')
+        response = self.client.get(url, {'q': 'AJAX'})
+        etag = response['ETag']
+        self.assertIn('private', response['Cache-Control'])
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        # Запросы только на сессию/права пользователя, не к сотрудникам
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, {'q': 'AJAX'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse(
+            [q for q in ctx.captured_queries if 'hr_humanresource' in q['sql']]
+        )
+
+        # Другой запрос — другой ETag
+        response = self.client.get(url, {'q': 'Сотрудник'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        # Изменение сотрудника сбрасывает ETag
+        with self.captureOnCommitCallbacks(execute=True):
+            self.employee.save()
+        response = self.client.get(url, {'q': 'AJAX'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    @patch('hr.views.cache_is_shared', return_value=False)
+    def test_autocomplete_no_etag_on_local_cache(self, _shared):
+        """На локальном кэше процесса ETag не выдаётся и 304 не бывает"""
+        url = reverse('hr:hr_manager_autocomplete')
+        response = self.client.get(url, {'q': 'AJAX'})
+        self.assertNotIn('ETag', response)
+
+        response = self.client.get(url, {'q': 'AJAX'}, HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, 200)
+
     def test_ajax_views_require_authentication(self):
         """Тест, что AJAX views требуют аутентификации"""
         self.client.logout()
@@ -486,19 +639,21 @@ class AjaxViewsTest(TestCase):
             self.assertIn(response.status_code, [302, 403])
 
 
-class ExportViewsTest(TestCase):
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
+class ExportViewsTest(LoginOnceMixin, TestCase):
     """Тесты для экспорта"""
 
-    def setUp(self):
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username='hruser',
             password='testpass123'
         )
         view_perm = Permission.objects.get(codename='view_humanresource')
-        self.user.user_permissions.add(view_perm)
+        cls.user.user_permissions.add(view_perm)
 
         # Создаем тестовых сотрудников
-        self.manager = HumanResource.objects.create(
+        cls.manager = HumanResource.objects.create(
             name="Экспортный Руководитель",
             job_title="Руководитель"
         )
@@ -507,11 +662,11 @@ class ExportViewsTest(TestCase):
             HumanResource.objects.create(
                 name=f"Сотрудник {i}",
                 job_title=f"Должность {i}",
-                manager=self.manager if i % 2 == 0 else None
+                manager=cls.manager if i % 2 == 0 else None
             )
 
-        self.client = Client()
-        self.client.force_login(self.user)
+        # Сессия на весь класс
+        cls._session_key = cls._login_once()
 
     def test_export_csv(self):
         """Тест экспорта в CSV"""
@@ -523,7 +678,10 @@ class ExportViewsTest(TestCase):
         self.assertIn('attachment', response['Content-Disposition'])
 
         # Проверяем содержимое
-        content = response.content.decode('utf-8-sig')
+        content = b''.join(response.streaming_content).decode('utf-8-sig')
+
+        # BOM только в начале файла
+        self.assertNotIn('\ufeff', content)
 
         # Проверяем заголовки
         self.assertIn('ФИО', content)
@@ -541,7 +699,7 @@ class ExportViewsTest(TestCase):
         url = reverse('hr:export_csv') + '?q=Сотрудник 1'
         response = self.client.get(url)
 
-        content = response.content.decode('utf-8-sig')
+        content = b''.join(response.streaming_content).decode('utf-8-sig')
         self.assertIn('Сотрудник 1', content)
 
         # Проверяем, что другие сотрудники не попали в экспорт
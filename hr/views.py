@@ -1,27 +1,53 @@
+import codecs
 import csv
+import hashlib
+import logging
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required, permission_required
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
-from django.db.models import Count, Q
-from django.http import JsonResponse, HttpResponse
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Prefetch, Q
+from django.http import StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse, reverse_lazy
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.views import View
-from django.views.decorators.http import require_GET
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET
 
+from core.cache import cache_is_shared
+from core.http import FastJsonResponse
 from core.views import BaseListView, BaseDetailView, BaseDeleteView
 from core.mixins import AuditMixin
+from .cache import get_form_managers, get_job_titles, get_stats_version, get_versioned
 from .models import HumanResource
 from .forms import HumanResourceForm
 
+logger = logging.getLogger(__name__)
+
 
 # =============================================================================
 # LIST VIEW
 # =============================================================================
 
+# GET-параметры дополнительных фильтров списка
+_FILTER_KEYS = ('manager', 'job_title', 'is_active', 'only_managers', 'has_subordinates')
+
+# Поля, по которым разрешена сортировка
+_SORT_ALLOWED = frozenset(('name', 'job_title'))
+
+
+def _parse_pk(value):
+    """Приводит GET-параметр к int (None, если пусто или не число)."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
 class HRListView(BaseListView):
     """Список сотрудников с поиском, фильтрацией и статистикой."""
 
@@ -41,8 +67,14 @@ class HRListView(BaseListView):
         """Queryset с аннотацией количества подчинённых."""
         qs = super().get_queryset()
 
-        # Аннотируем количество подчинённых
-        qs = qs.annotate(sub_count=Count('subordinates'))
+        # Только колонки, которые выводит шаблон списка
+        qs = qs.only(
+            'id', 'name', 'job_title', 'is_active',
+            'manager_id', 'manager__name',
+        )
+
+        # Количество подчинённых — подзапросом, без GROUP BY
+        qs = qs.annotate(sub_count=qs.subordinates_count_expr())
 
         # Дополнительные фильтры
         qs = self._apply_extra_filters(qs)
@@ -54,9 +86,13 @@ class HRListView(BaseListView):
 
     def _apply_extra_filters(self, qs):
         """Применяет дополнительные фильтры."""
+        # Без фильтров (самый частый случай) queryset не трогаем
+        if not any(self.request.GET.get(k) for k in _FILTER_KEYS):
+            return qs
+
         # Руководитель
-        manager_id = self.request.GET.get("manager")
-        if manager_id:
+        manager_id = _parse_pk(self.request.GET.get("manager"))
+        if manager_id is not None:
             qs = qs.filter(manager_id=manager_id)
 
         # Должность
@@ -69,15 +105,9 @@ class HRListView(BaseListView):
         if is_active:
             qs = qs.filter(is_active=(is_active == 'true'))
 
-        # Только руководители
-        only_managers = self.request.GET.get("only_managers")
-        if only_managers:
-            qs = qs.filter(sub_count__gt=0)
-
-        # Есть подчинённые
-        has_subordinates = self.request.GET.get("has_subordinates")
-        if has_subordinates:
-            qs = qs.filter(sub_count__gt=0)
+        # Только руководители / есть подчинённые
+        if self.request.GET.get("only_managers") or self.request.GET.get("has_subordinates"):
+            qs = qs.managers_only()
 
         return qs
 
@@ -86,7 +116,7 @@ class HRListView(BaseListView):
         sort_by = self.request.GET.get('sort', 'name')
         order = self.request.GET.get('order', 'asc')
 
-        if sort_by in ['name', 'job_title']:
+        if sort_by in _SORT_ALLOWED:
             if order == 'desc':
                 sort_by = f'-{sort_by}'
             qs = qs.order_by(sort_by)
@@ -109,39 +139,32 @@ class HRListView(BaseListView):
             "order": self.request.GET.get("order", "asc"),
         }
 
-        # Данные для фильтров
-        context["managers"] = HumanResource.objects.filter(
-            is_active=True
-        ).order_by('name')
-
-        # Список уникальных должностей
-        context["job_titles"] = HumanResource.objects.exclude(
-            job_title=""
-        ).values_list('job_title', flat=True).distinct()
-
-        # Статистика
-        context["stats"] = self._get_stats()
+        # Данные для фильтров и статистика (кэшируются до изменения сотрудников)
+        context.update(get_versioned("list_context", self._get_filter_data))
 
         return context
 
-    def _get_stats(self):
-        """Возвращает статистику по сотрудникам."""
-        total = HumanResource.objects.count()
-        active = HumanResource.objects.filter(is_active=True).count()
+    def _get_filter_data(self):
+        """Возвращает данные фильтров и статистику по сотрудникам."""
+        managers = list(
+            HumanResource.objects.active_by_name()
+            .values('pk', 'name')
+        )
 
-        managers_count = HumanResource.objects.annotate(
-            sub_cnt=Count('subordinates')
-        ).filter(sub_cnt__gt=0).count()
+        # Список уникальных должностей
+        job_titles = tuple(get_job_titles())
 
-        job_titles_count = HumanResource.objects.exclude(
-            job_title=""
-        ).values_list('job_title', flat=True).distinct().count()
+        stats = HumanResource.objects.aggregate(
+            total=Count('id'),
+            active=Count('id', filter=Q(is_active=True)),
+            managers=Count('id', filter=Q(is_manager=True)),
+        )
+        stats["job_titles"] = len(job_titles)
 
         return {
-            "total": total,
-            "active": active,
-            "managers": managers_count,
-            "job_titles": job_titles_count,
+            "managers": managers,
+            "job_titles": job_titles,
+            "stats": stats,
         }
 
 
@@ -157,15 +180,35 @@ class HRDetailView(BaseDetailView):
     context_object_name = "employee"
     select_related = ['manager']
 
+    def get_queryset(self):
+        """Queryset с подгруженными подчинёнными."""
+        return super().get_queryset().only(
+            'id', 'name', 'job_title', 'is_active', 'created_at', 'updated_at',
+            'manager_id', 'manager__name', 'manager__job_title',
+        ).prefetch_related(
+            # Один запрос и для счётчика, и для таблицы подчинённых
+            Prefetch(
+                'subordinates',
+                queryset=HumanResource.objects.only(
+                    'id', 'name', 'job_title', 'is_active', 'manager_id'
+                ).order_by('name'),
+            )
+        )
+
     def get_context_data(self, **kwargs):
         """Добавляет подчинённых и историю."""
         context = super().get_context_data(**kwargs)
 
-        context['subordinates_count'] = self.object.subordinates.count()
+        context['subordinates_count'] = len(self.object.subordinates.all())
 
-        # История изменений (последние 10)
+        # История изменений (последние 10), вычисляется один раз
         if hasattr(self.object, 'history'):
-            context['history'] = self.object.history.all()[:10]
+            context['history'] = list(
+                self.object.history
+                .select_related('history_user')
+                .only('history_date', 'history_change_reason', 'history_user__username')
+                .order_by('-history_date')[:10]
+            )
 
         return context
 
@@ -190,9 +233,12 @@ class HRCreateView(LoginRequiredMixin, PermissionRequiredMixin, AuditMixin, View
         manager_info = None
         initial_manager = None
 
-        if manager_id:
+        manager_pk = _parse_pk(manager_id)
+        if manager_pk is not None:
             try:
-                manager_instance = HumanResource.objects.get(pk=manager_id)
+                manager_instance = HumanResource.objects.only(
+                    'id', 'name', 'job_title'
+                ).get(pk=manager_pk)
                 initial_manager = manager_instance
                 form = HumanResourceForm(initial={'manager': manager_instance})
                 manager_info = {
@@ -218,9 +264,11 @@ class HRCreateView(LoginRequiredMixin, PermissionRequiredMixin, AuditMixin, View
 
         if form.is_valid():
             try:
-                obj = form.save(commit=False)
-                self.add_audit_info(obj)
-                obj.save()
+                # Запись сотрудника и строки истории — одна транзакция
+                with transaction.atomic():
+                    obj = form.save(commit=False)
+                    self.add_audit_info(obj)
+                    obj.save()
 
                 # Обработка "Сохранить и добавить ещё"
                 if request.POST.get('save_and_add'):
@@ -230,8 +278,12 @@ class HRCreateView(LoginRequiredMixin, PermissionRequiredMixin, AuditMixin, View
                 messages.success(request, _('Сотрудник "{}" создан').format(obj.name))
                 return redirect('hr:hr_detail', pk=obj.pk)
 
-            except Exception as e:
-                messages.error(request, _('Ошибка: {}').format(str(e)))
+            except ValidationError as e:
+                form.add_error(None, e.messages)
+                messages.error(request, _('Исправьте ошибки в форме'))
+            except IntegrityError:
+                logger.exception("Ошибка БД при создании сотрудника")
+                messages.error(request, _('Не удалось сохранить сотрудника'))
         else:
             messages.error(request, _('Исправьте ошибки в форме'))
 
@@ -240,26 +292,14 @@ class HRCreateView(LoginRequiredMixin, PermissionRequiredMixin, AuditMixin, View
 
     def _get_form_context(self, form, create=True):
         """Возвращает контекст для формы."""
-        all_managers = HumanResource.objects.filter(
-            is_active=True
-        ).order_by('name').values('id', 'name', 'job_title')[:100]
-
-        all_job_titles = HumanResource.objects.exclude(
-            job_title=""
-        ).values_list('job_title', flat=True).distinct().order_by('job_title')[:100]
-
-        job_titles = HumanResource.objects.exclude(
-            job_title__isnull=True
-        ).exclude(
-            job_title=""
-        ).values_list('job_title', flat=True).distinct().order_by('job_title')
+        job_titles = get_job_titles()
 
         return {
             'form': form,
             'create': create,
             'job_titles': job_titles,
-            'all_managers': list(all_managers),
-            'all_job_titles': list(all_job_titles),
+            'all_managers': get_form_managers()[:100],
+            'all_job_titles': job_titles[:100],
         }
 
 
@@ -290,14 +330,23 @@ class HRUpdateView(LoginRequiredMixin, PermissionRequiredMixin, AuditMixin, View
         if form.is_valid():
             try:
                 obj = form.save(commit=False)
-                self.add_audit_info(obj)
-                obj.save()
+
+                # Обновляем только изменённые колонки; запись сотрудника
+                # и строки истории — одна транзакция
+                if form.has_changed():
+                    with transaction.atomic():
+                        self.add_audit_info(obj)
+                        obj.save(update_fields=[*form.changed_data, 'updated_at'])
 
                 messages.success(request, _('Изменения сохранены'))
                 return redirect('hr:hr_detail', pk=obj.pk)
 
-            except Exception as e:
-                messages.error(request, _('Ошибка: {}').format(str(e)))
+            except ValidationError as e:
+                form.add_error(None, e.messages)
+                messages.error(request, _('Исправьте ошибки в форме'))
+            except IntegrityError:
+                logger.exception("Ошибка БД при изменении сотрудника %s", obj.pk)
+                messages.error(request, _('Не удалось сохранить изменения'))
         else:
             messages.error(request, _('Исправьте ошибки в форме'))
 
@@ -306,25 +355,20 @@ class HRUpdateView(LoginRequiredMixin, PermissionRequiredMixin, AuditMixin, View
 
     def _get_form_context(self, form, obj, create=False):
         """Возвращает контекст для формы."""
-        all_managers = HumanResource.objects.filter(
-            is_active=True
-        ).exclude(pk=obj.pk).order_by('name').values('id', 'name', 'job_title')[:100]
-
-        all_job_titles = HumanResource.objects.exclude(
-            job_title=""
-        ).values_list('job_title', flat=True).distinct().order_by('job_title')[:100]
+        # Список общий для всех форм — текущего сотрудника убираем здесь
+        all_managers = [
+            m for m in get_form_managers() if m['id'] != obj.pk
+        ][:100]
 
-        job_titles = HumanResource.objects.exclude(
-            job_title=""
-        ).values_list('job_title', flat=True).distinct()
+        job_titles = get_job_titles()
 
         return {
             'form': form,
             'create': create,
             'object': obj,
             'job_titles': job_titles,
-            'all_managers': list(all_managers),
-            'all_job_titles': list(all_job_titles),
+            'all_managers': all_managers,
+            'all_job_titles': job_titles[:100],
         }
 
 
@@ -345,56 +389,93 @@ class HumanResourceDeleteView(PermissionRequiredMixin, BaseDeleteView):
 # AJAX VIEWS
 # =============================================================================
 
+# Минимальная длина строки поиска руководителя
+_AUTOCOMPLETE_MIN_QUERY = 2
+
+# Размер страницы автодополнения руководителей
+_AUTOCOMPLETE_PAGE = 20
+
+
+def _autocomplete_etag(request, *args, **kwargs):
+    """
+    ETag автодополнения: версия данных сотрудников + строка запроса.
+
+    Версия хранится в кэше и увеличивается при любом сохранении/удалении
+    сотрудника, поэтому 304 отдаётся без обращения к БД.
+    Ответ помечается no-cache: браузер переспрашивает сервер с
+    If-None-Match на каждый ввод, а не берёт устаревший список из кэша.
+    На локальном кэше процесса версия у каждого воркера своя —
+    ETag не выдаём, чтобы не отвечать 304 на устаревшие данные.
+    """
+    if not cache_is_shared():
+        return None
+    query = hashlib.md5(request.GET.urlencode().encode()).hexdigest()
+    return f"{get_stats_version()}-{query}"
+
+
 @require_GET
 @login_required
 @permission_required('hr.view_humanresource', raise_exception=True)
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_autocomplete_etag)
 def hr_manager_autocomplete(request):
     """Автодополнение для поиска руководителей (TomSelect)."""
     q = request.GET.get("q", "").strip()
 
-    qs = HumanResource.objects.filter(is_active=True)
+    # Один символ — icontains без пользы для триграммного индекса,
+    # а совпадений всё равно слишком много: в БД не ходим
+    if 0 < len(q) < _AUTOCOMPLETE_MIN_QUERY:
+        return FastJsonResponse({"results": []})
+
+    # (name, id) — уникальный ключ сортировки для keyset-пагинации
+    qs = HumanResource.objects.active_by_name().order_by("name", "id")
 
     if q:
         qs = qs.filter(name__icontains=q)
 
-    qs = qs.order_by("name")[:20]
+    # Следующая страница: строки после последней показанной, без OFFSET
+    after = request.GET.get("after")
+    after_id = _parse_pk(request.GET.get("after_id"))
+    if after is not None and after_id is not None:
+        qs = qs.filter(Q(name__gt=after) | Q(name=after, id__gt=after_id))
 
-    return JsonResponse({
+    rows = list(qs.values("id", "name", "job_title")[:_AUTOCOMPLETE_PAGE])
+
+    data = {
         "results": [
             {
-                "id": x.pk,
-                "text": f"{x.name} — {x.job_title}" if x.job_title else x.name
+                "id": row["id"],
+                "text": f"{row['name']} — {row['job_title']}" if row["job_title"] else row["name"]
             }
-            for x in qs
+            for row in rows
         ]
-    })
+    }
+    if len(rows) == _AUTOCOMPLETE_PAGE:
+        data["next"] = {"after": rows[-1]["name"], "after_id": rows[-1]["id"]}
+
+    return FastJsonResponse(data)
 
 
 @require_GET
 @login_required
 @permission_required('hr.view_humanresource', raise_exception=True)
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_autocomplete_etag)
 def hr_job_title_autocomplete(request):
     """Автодополнение для должностей (TomSelect)."""
     q = request.GET.get("q", "").strip()
     load_all = request.GET.get("load_all", "")
 
-    qs = HumanResource.objects.exclude(job_title="")
+    # Справочник должностей небольшой и кэшируется — фильтруем в Python
+    all_titles = get_job_titles()
 
     if load_all == "true" or not q:
-        titles = (
-            qs.values_list("job_title", flat=True)
-            .distinct()
-            .order_by("job_title")[:100]
-        )
+        titles = all_titles[:100]
     else:
-        qs = qs.filter(job_title__icontains=q)
-        titles = (
-            qs.values_list("job_title", flat=True)
-            .distinct()
-            .order_by("job_title")[:20]
-        )
+        needle = q.casefold()
+        titles = [title for title in all_titles if needle in title.casefold()][:20]
 
-    return JsonResponse({
+    return FastJsonResponse({
         "results": [{"value": title, "text": title} for title in titles]
     })
 
@@ -403,13 +484,33 @@ def hr_job_title_autocomplete(request):
 # EXPORT VIEW
 # =============================================================================
 
+# Заголовок CSV-экспорта (ленивые переводы, в строки — один раз на запрос)
+_CSV_HEADER = (
+    _("ФИО"),
+    _("Должность"),
+    _("Руководитель"),
+    _("Активен"),
+    _("Подчинённых"),
+    _("Создан"),
+    _("Обновлён"),
+)
+_CSV_YES, _CSV_NO = _("Да"), _("Нет")
+
+
+class _Echo:
+    """Псевдо-файл для csv.writer: возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
 @require_GET
 @login_required
 @permission_required('hr.view_humanresource', raise_exception=True)
 def export_hr_csv(request):
     """Экспорт сотрудников в CSV."""
     # Базовый queryset
-    queryset = HumanResource.objects.all().select_related('manager')
+    queryset = HumanResource.objects.all()
 
     # Применяем фильтры из запроса
     q = request.GET.get("q")
@@ -418,43 +519,51 @@ def export_hr_csv(request):
             Q(name__icontains=q) | Q(job_title__icontains=q)
         )
 
-    manager = request.GET.get("manager")
-    if manager:
+    manager = _parse_pk(request.GET.get("manager"))
+    if manager is not None:
         queryset = queryset.filter(manager_id=manager)
 
     job_title = request.GET.get("job_title")
     if job_title:
         queryset = queryset.filter(job_title__icontains=job_title)
 
-    # HTTP Response
-    response = HttpResponse(content_type='text/csv; charset=utf-8-sig')
+    # Кортежи вместо экземпляров модели — только нужные колонки
+    queryset = queryset.annotate(sub_count=Count('subordinates')).values_list(
+        'name', 'job_title', 'manager__name', 'is_active', 'sub_count',
+        'created_at', 'updated_at',
+    )
+
+    writer = csv.writer(_Echo(), delimiter=';')
+
+    # Переводы — сейчас, пока активен язык запроса: генератор
+    # выполняется уже после прохода через middleware
+    header = [str(title) for title in _CSV_HEADER]
+    yes, no = str(_CSV_YES), str(_CSV_NO)
+
+    def rows():
+        # BOM один раз в начале файла (для Excel)
+        yield codecs.BOM_UTF8
+
+        # Заголовки
+        yield writer.writerow(header).encode('utf-8')
+
+        # Данные
+        for (name, job_title, manager_name, is_active, sub_count,
+             created_at, updated_at) in queryset.iterator(chunk_size=2000):
+            yield writer.writerow([
+                name,
+                job_title or "",
+                manager_name or "",
+                yes if is_active else no,
+                sub_count,
+                created_at.strftime("%d.%m.%Y %H:%M"),
+                updated_at.strftime("%d.%m.%Y %H:%M"),
+            ]).encode('utf-8')
+
+    # Потоковый ответ: строки отдаются по мере чтения из БД
+    response = StreamingHttpResponse(rows(), content_type='text/csv; charset=utf-8-sig')
     response['Content-Disposition'] = (
         f'attachment; filename="hr_{timezone.now().strftime("%Y%m%d_%H%M%S")}.csv"'
     )
 
-    writer = csv.writer(response, delimiter=';')
-
-    # Заголовки
-    writer.writerow([
-        _("ФИО"),
-        _("Должность"),
-        _("Руководитель"),
-        _("Активен"),
-        _("Подчинённых"),
-        _("Создан"),
-        _("Обновлён"),
-    ])
-
-    # Данные
-    for emp in queryset:
-        writer.writerow([
-            emp.name,
-            emp.job_title or "",
-            emp.manager.name if emp.manager else "",
-            _("Да") if emp.is_active else _("Нет"),
-            emp.subordinates.count(),
-            emp.created_at.strftime("%d.%m.%Y %H:%M"),
-            emp.updated_at.strftime("%d.%m.%Y %H:%M"),
-        ])
-
     return response
@@ -4,7 +4,10 @@ Inventory Admin - Склады и Материалы
 """
 
 from django.contrib import admin
+from django.db import models
+from django.db.models.functions import Coalesce
 from django.utils.html import format_html
+from django.utils.safestring import mark_safe
 from simple_history.admin import SimpleHistoryAdmin
 
 from core.admin_base import BaseModelAdminWithActive
@@ -15,6 +18,9 @@ from .models import Warehouse, Material
 # WAREHOUSE ADMIN
 # =============================================================================
 
+_MATERIALS_ZERO_BADGE = mark_safe('<span class="text-muted">0</span>')
+
+
 @admin.register(Warehouse)
 class WarehouseAdmin(BaseModelAdminWithActive):
     """Админка складов."""
@@ -47,23 +53,32 @@ class WarehouseAdmin(BaseModelAdminWithActive):
         }),
     )
     
-    @admin.display(description="Локация")
+    def get_queryset(self, request):
+        """Аннотируем количество материалов и подписи связанных объектов."""
+        qs = super().get_queryset(request)
+        return qs.annotate(
+            _materials_cnt=models.Count("materials"),
+            _loc=Coalesce("location__name", models.Value("—")),
+            _resp=Coalesce("responsible__name", models.Value("—")),
+        )
+    
+    @admin.display(description="Локация", ordering="_loc")
     def display_location(self, obj):
-        return obj.location.name if obj.location else "—"
+        return obj._loc
     
-    @admin.display(description="Ответственный")
+    @admin.display(description="Ответственный", ordering="_resp")
     def display_responsible(self, obj):
-        return obj.responsible.name if obj.responsible else "—"
+        return obj._resp
     
     @admin.display(description="Материалы")
     def materials_count_badge(self, obj):
-        count = obj.materials_count
+        count = getattr(obj, "_materials_cnt", 0)
         if count > 0:
             return format_html(
                 '<span class="badge bg-primary">{}</span>',
                 count
             )
-        return format_html('<span class="text-muted">0</span>')
+        return _MATERIALS_ZERO_BADGE
     
     @admin.display(description="Сводка по материалам")
     def materials_summary(self, obj):
@@ -84,6 +99,20 @@ class WarehouseAdmin(BaseModelAdminWithActive):
 # MATERIAL ADMIN
 # =============================================================================
 
+# Бейджи статуса запаса — набор фиксированный, собираем один раз
+_STOCK_STATUS_BADGES = {
+    status: format_html('<span class="badge bg-{}">{}</span>', color, text)
+    for status, (color, text) in {
+        "inactive": ("secondary", "Неактивен"),
+        "out_of_stock": ("danger", "Отсутствует"),
+        "low_stock": ("warning", "Низкий запас"),
+        "reserved": ("info", "В резерве"),
+        "in_stock": ("success", "В наличии"),
+    }.items()
+}
+_STOCK_STATUS_DEFAULT = mark_safe('<span class="badge bg-secondary">—</span>')
+
+
 @admin.register(Material)
 class MaterialAdmin(BaseModelAdminWithActive):
     """Админка материалов."""
@@ -104,7 +133,8 @@ class MaterialAdmin(BaseModelAdminWithActive):
     list_filter = ("warehouse", "is_active", "uom", "group")
     ordering = ("name",)
     readonly_fields = ("last_change", "qty_total_display", "stock_status_display_readonly")
-    filter_horizontal = ("suitable_for",)
+    # Выбор через AJAX-поиск вместо загрузки всех объектов в форму
+    autocomplete_fields = ("suitable_for", "warehouse")
     
     fieldsets = (
         ("Основная информация", {
@@ -134,9 +164,14 @@ class MaterialAdmin(BaseModelAdminWithActive):
         }),
     )
     
-    @admin.display(description="Склад")
+    def get_queryset(self, request):
+        """Аннотируем название склада."""
+        qs = super().get_queryset(request)
+        return qs.annotate(_wh=Coalesce("warehouse__name", models.Value("—")))
+    
+    @admin.display(description="Склад", ordering="_wh")
     def display_warehouse(self, obj):
-        return obj.warehouse.name if obj.warehouse else "—"
+        return obj._wh
     
     @admin.display(description="Всего")
     def qty_total_display(self, obj):
@@ -148,15 +183,7 @@ class MaterialAdmin(BaseModelAdminWithActive):
     
     @admin.display(description="Статус")
     def stock_status_badge(self, obj):
-        status_map = {
-            "inactive": ("secondary", "Неактивен"),
-            "out_of_stock": ("danger", "Отсутствует"),
-            "low_stock": ("warning", "Низкий запас"),
-            "reserved": ("info", "В резерве"),
-            "in_stock": ("success", "В наличии"),
-        }
-        color, text = status_map.get(obj.stock_status, ("secondary", "—"))
-        return format_html('<span class="badge bg-{}">{}</span>', color, text)
+        return _STOCK_STATUS_BADGES.get(obj.stock_status, _STOCK_STATUS_DEFAULT)
     
     @admin.display(description="Активен", boolean=True)
     def is_active_badge(self, obj):
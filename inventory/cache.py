@@ -0,0 +1,45 @@
+"""
+inventory/cache.py
+
+Кэширование списков выбора складов и рабочих мест для форм материалов.
+
+Записи сбрасываются сигналами при сохранении/удалении склада или
+рабочего места (см. inventory/signals.py). Сброс виден всем воркерам
+только в общем кэше, поэтому на локальном кэше процесса списки
+читаются из БД напрямую.
+"""
+
+from django.core.cache import cache
+
+from core.cache import cache_is_shared
+
+WAREHOUSE_CHOICES_KEY = "inventory:warehouse_choices"
+WORKSTATION_CHOICES_KEY = "inventory:workstation_choices"
+CHOICES_TTL = 300  # 5 минут
+
+
+def _get_or_set(key, default):
+    """cache.get_or_set только для общего кэша."""
+    if not cache_is_shared():
+        return default()
+    return cache.get_or_set(key, default, timeout=CHOICES_TTL)
+
+
+def get_warehouse_choices():
+    """Список (pk, name) складов по алфавиту."""
+    from .models import Warehouse
+
+    return _get_or_set(
+        WAREHOUSE_CHOICES_KEY,
+        lambda: list(Warehouse.objects.order_by("name").values_list("pk", "name")),
+    )
+
+
+def get_workstation_choices():
+    """Список (pk, name) рабочих мест по алфавиту."""
+    from assets.models import Workstation
+
+    return _get_or_set(
+        WORKSTATION_CHOICES_KEY,
+        lambda: list(Workstation.objects.order_by("name").values_list("pk", "name")),
+    )
@@ -6,8 +6,10 @@ Inventory Forms - Склады и Материалы
 from django import forms
 from django.forms import ClearableFileInput
 
+from assets.models import Workstation
 from hr.models import HumanResource
 from locations.models import Location
+from .cache import get_warehouse_choices, get_workstation_choices
 from .models import Warehouse, Material
 
 
@@ -34,9 +36,10 @@ class MaterialSelectWithImage(forms.Select):
             name, value, label, selected, index, subindex=subindex, attrs=attrs
         )
         
-        if value and hasattr(value, "value"):
-            material_id = value.value
-            material = self.choices.queryset.filter(pk=material_id).first()
+        # ModelChoiceIteratorValue уже содержит объект из queryset —
+        # отдельный запрос на каждую опцию не нужен
+        if value and hasattr(value, "instance"):
+            material = value.instance
             
             if material:
                 if material.image:
@@ -74,10 +77,13 @@ class WarehouseForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
         
         # Queryset для связанных полей
-        self.fields["location"].queryset = Location.objects.all().order_by("name")
-        self.fields["responsible"].queryset = HumanResource.objects.filter(
-            is_active=True
-        ).order_by("name")
+        # Только колонки, нужные для подписи опции (__str__)
+        self.fields["location"].queryset = Location.objects.order_by("name").only(
+            "pk", "name"
+        )
+        self.fields["responsible"].queryset = HumanResource.objects.active_by_name().only(
+            "pk", "name", "job_title"
+        )
         
         # Необязательные поля
         self.fields["location"].required = False
@@ -178,11 +184,14 @@ class MaterialForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         
-        # Queryset для связанных полей
-        self.fields["warehouse"].queryset = Warehouse.objects.all().order_by("name")
-        
-        from assets.models import Workstation
-        self.fields["suitable_for"].queryset = Workstation.objects.all().order_by("name")
+        # Queryset полей нужен только для валидации отправленного значения
+        self.fields["warehouse"].queryset = Warehouse.objects.only("pk", "name")
+        self.fields["suitable_for"].queryset = Workstation.objects.only("pk", "name")
+
+        # Варианты выбора — из кэша, без запроса и обхода queryset
+        warehouse = self.fields["warehouse"]
+        warehouse.choices = [("", warehouse.empty_label), *get_warehouse_choices()]
+        self.fields["suitable_for"].choices = get_workstation_choices()
         
         # обязательные поля
         req_fields = [
@@ -75,17 +75,19 @@ class Warehouse(BaseInventoryModel):
 
     def get_materials_summary(self):
         """Сводная информация по материалам"""
-        from django.db.models import Sum
-        materials = self.materials.all()
+        from django.db.models import Count, Sum
+
+        # Один запрос вместо трёх
+        summary = self.materials.aggregate(
+            total_count=Count('pk'),
+            total_available=Sum('qty_available'),
+            total_reserved=Sum('qty_reserved'),
+        )
 
         return {
-            'total_count': materials.count(),
-            'total_available': materials.aggregate(
-                total=Sum('qty_available')
-            )['total'] or Decimal('0'),
-            'total_reserved': materials.aggregate(
-                total=Sum('qty_reserved')
-            )['total'] or Decimal('0'),
+            'total_count': summary['total_count'],
+            'total_available': summary['total_available'] or Decimal('0'),
+            'total_reserved': summary['total_reserved'] or Decimal('0'),
         }
 
 
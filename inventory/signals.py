@@ -0,0 +1,25 @@
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from assets.models import Workstation
+
+from .cache import WAREHOUSE_CHOICES_KEY, WORKSTATION_CHOICES_KEY
+from .models import Warehouse
+
+
+@receiver(post_save, sender=Warehouse)
+@receiver(post_delete, sender=Warehouse)
+def invalidate_warehouse_choices(sender, **kwargs):
+    """Сбрасывает кэш списка складов для форм"""
+    transaction.on_commit(partial(cache.delete, WAREHOUSE_CHOICES_KEY))
+
+
+@receiver(post_save, sender=Workstation)
+@receiver(post_delete, sender=Workstation)
+def invalidate_workstation_choices(sender, **kwargs):
+    """Сбрасывает кэш списка рабочих мест для форм"""
+    transaction.on_commit(partial(cache.delete, WORKSTATION_CHOICES_KEY))
@@ -13,6 +13,7 @@ from django.views.decorators.http import require_GET
 
 from core.audit import build_change_reason
 from core.views import BaseListView, BaseDetailView, BaseDeleteView
+from .cache import get_warehouse_choices
 from .models import Warehouse, Material
 from .forms import WarehouseForm, MaterialForm
 
@@ -193,7 +194,8 @@ class MaterialListView(BaseListView):
         context.update({
             "total_available": summary["total_available"] or 0,
             "total_reserved": summary["total_reserved"] or 0,
-            "warehouses": Warehouse.objects.all().order_by("name"),
+            # Список складов для фильтра — (pk, name) из кэша
+            "warehouses": get_warehouse_choices(),
         })
         
         return context
@@ -244,7 +246,6 @@ def material_create(request):
     return render(request, "inventory/material/form.html", {
         "form": form,
         "create": True,
-        "warehouses": Warehouse.objects.all().order_by("name"),
     })
 
 
@@ -271,7 +272,6 @@ def material_update(request, pk):
         "form": form,
         "create": False,
         "object": material,
-        "warehouses": Warehouse.objects.all().order_by("name"),
     })
 
 
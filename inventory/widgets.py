@@ -13,11 +13,9 @@ class MaterialSelectWithImage(forms.Select):
         )
 
         # 🔑 ВАЖНО: value — это ModelChoiceIteratorValue
-        if value and hasattr(value, "value"):
-            material_id = value.value
-
-            # Получаем материал из кеша или запроса
-            material = self.choices.queryset.filter(pk=material_id).first()
+        if value and hasattr(value, "instance"):
+            # Объект уже загружен итератором choices — без запроса к БД
+            material = value.instance
             if material and material.image:
                 option["attrs"]["data-image"] = material.image.url
                 # Добавляем класс для стилизации
@@ -6,6 +6,7 @@ Refactored: 2026-01-06
 """
 
 import os
+import sys
 from pathlib import Path
 
 from celery.schedules import crontab
@@ -170,6 +171,33 @@ LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/login/'
 
+# =============================================================================
+# CACHE
+# =============================================================================
+
+# Общий кэш для всех воркеров gunicorn: версии кэша hr и списки выбора
+# сбрасываются сигналами и должны быть видны каждому процессу.
+# Без CACHE_URL — локальный кэш процесса (разработка без Redis).
+# manage.py test всегда работает на локальном кэше, чтобы не читать
+# и не засорять общий кэш рабочего окружения.
+TESTING = len(sys.argv) > 1 and sys.argv[1] == 'test'
+CACHE_URL = '' if TESTING else os.getenv('CACHE_URL', '')
+
+if CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+            'KEY_PREFIX': 'toir',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # =============================================================================
 # CELERY CONFIGURATION
 # =============================================================================